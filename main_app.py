@@ -4,18 +4,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+from collections import deque
+from itertools import groupby, islice
+from concurrent.futures import ThreadPoolExecutor
 import sqlite3
 import os
+import hashlib
+import html
+import json
+import re
+import string
 
 # Import your custom modules with error handling
 try:
     from utils.database_manager import DatabaseManager
-    from utils.prioritization_engine import FeaturePrioritizationEngine
-    from utils.analytics_engine import ProductAnalytics
+    from utils.prioritization_engine import FeaturePrioritizationEngine, ROADMAP_QUARTERS
+    from utils.analytics_engine import ProductAnalytics, DashboardData
     from utils.ai_assistant import ProductAIAssistant
 except ImportError as e:
     st.error(f"Error importing modules: {str(e)}")
@@ -30,9 +37,7 @@ st.set_page_config(
 )
 
 # Fixed Dark Mode CSS - Only Dark Theme
-def get_dark_theme_css():
-    """Return consistent dark theme CSS"""
-    return """
+DARK_THEME_CSS = """
 <style>
     /* Dark Theme Variables */
     :root {
@@ -112,7 +117,7 @@ def get_dark_theme_css():
         color: var(--text-primary) !important;
     }
     
-    .sidebar-content {
+    [class*="st-key-sidebar-"] {
         background: var(--bg-card) !important;
         color: var(--text-primary) !important;
         padding: 1.5rem;
@@ -212,44 +217,173 @@ def get_dark_theme_css():
 </style>
 """
 
-def initialize_session_state():
-    """Initialize session state with error handling"""
+def _minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{}:;,>])\s*", r"\1", css).strip()
+
+# Sent on every rerun, so shrink it once at import
+_INJECTED_THEME_CSS = _minify_css(DARK_THEME_CSS)
+
+def inject_theme_css():
+    """Emit the theme stylesheet without adding a visible markdown block"""
+    # Streamlit drops elements that a rerun doesn't re-emit, so this runs every rerun
+    st.html(_INJECTED_THEME_CSS)
+
+def _ensure_state(key, factory):
+    """Create a session state entry on first use; factory is skipped once the key exists"""
+    if key not in st.session_state:
+        st.session_state[key] = factory()
+    return st.session_state[key]
+
+@st.cache_resource
+def get_db():
+    """One DatabaseManager for the whole server, so setup and pragmas run once"""
+    return DatabaseManager()
+
+def _init_db():
+    """Open the database manager; False if the database can't be created"""
     try:
-        if 'db_manager' not in st.session_state:
-            st.session_state.db_manager = DatabaseManager()
-        
-        if 'prioritization_engine' not in st.session_state:
-            st.session_state.prioritization_engine = FeaturePrioritizationEngine(st.session_state.db_manager)
-        
-        if 'analytics' not in st.session_state:
-            st.session_state.analytics = ProductAnalytics(
-                st.session_state.db_manager,
-                st.session_state.prioritization_engine
-            )
-        
-        if 'ai_assistant' not in st.session_state:
-            st.session_state.ai_assistant = ProductAIAssistant(
-                st.session_state.db_manager,
-                st.session_state.analytics
-            )
+        _ensure_state('db_manager', get_db)
+    except (sqlite3.Error, OSError) as e:
+        st.error(f"Error initializing database: {str(e)}")
+        return False
+    
+    return True
+
+def _init_engines():
+    """Build the prioritization, analytics and AI engines on top of the database"""
+    db_manager = st.session_state.db_manager
+    
+    try:
+        prioritization_engine = _ensure_state(
+            'prioritization_engine',
+            lambda: FeaturePrioritizationEngine(db_manager)
+        )
         
-        if 'dashboard_data' not in st.session_state:
-            st.session_state.dashboard_data = None
+        analytics = _ensure_state(
+            'analytics',
+            lambda: ProductAnalytics(db_manager, prioritization_engine)
+        )
         
-        if 'chat_messages' not in st.session_state:
-            st.session_state.chat_messages = [{
-                "role": "assistant",
-                "content": "Hello! 👋 I'm your AI Product Assistant. I can help you analyze feature priorities, roadmap planning, ROI calculations, and strategic decisions. What would you like to know?"
-            }]
-            
-    except Exception as e:
-        st.error(f"Error initializing application: {str(e)}")
+        _ensure_state('ai_assistant', lambda: ProductAIAssistant(db_manager, analytics))
+    except OSError as e:
+        st.error(f"Error initializing engines: {str(e)}")
         return False
     
     return True
 
-@st.cache_data(ttl=300, show_spinner=True)
-def load_dashboard_data():
+# Oldest chat messages are dropped past this many (50 turns) so reruns don't redraw
+# an unbounded history and long-lived sessions hold a fixed amount of chat memory
+CHAT_HISTORY_LIMIT = 100
+
+# Only the most recent messages are drawn inline; older ones wait behind an expander
+CHAT_INLINE_MESSAGES = 20
+
+def _init_ui_state():
+    """Seed dashboard and chat state"""
+    st.session_state.setdefault('dashboard_data', None)
+    st.session_state.setdefault('chat_messages', deque([{
+        "role": "assistant",
+        "content": "Hello! 👋 I'm your AI Product Assistant. I can help you analyze feature priorities, roadmap planning, ROI calculations, and strategic decisions. What would you like to know?"
+    }], maxlen=CHAT_HISTORY_LIMIT))
+    
+    return True
+
+def push_chat(role, content):
+    """Append a chat message; the bounded deque evicts the oldest past the limit"""
+    st.session_state.chat_messages.append({"role": role, "content": content})
+
+def initialize_session_state():
+    """Initialize session state; False if any step failed"""
+    # Steady-state reruns skip the per-key checks below
+    if st.session_state.get('_init_done'):
+        return True
+    
+    st.session_state._init_done = _init_db() and _init_engines() and _init_ui_state()
+    return st.session_state._init_done
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _db_has_data():
+    """Cheap cached check for whether the feedback table has any rows"""
+    return st.session_state.db_manager.has_feedback()
+
+@st.cache_data(show_spinner=False)
+def _db_summary(db_mtime):
+    """Feedback counts from one SQL aggregate, cached per database version"""
+    return st.session_state.db_manager.get_executive_summary_sql()
+
+def _db_mtime():
+    """Modification time of the SQLite file, used to invalidate cached dashboard data"""
+    db_path = st.session_state.db_manager.db_path
+    # In WAL mode writes land in the -wal file until the next checkpoint; an empty one
+    # is just created on open and says nothing about the data
+    wal_path = f"{db_path}-wal"
+    if os.path.exists(wal_path) and os.path.getsize(wal_path) > 0:
+        return max(os.path.getmtime(db_path), os.path.getmtime(wal_path))
+    return os.path.getmtime(db_path)
+
+# Scored analysis persisted per database version so a restarted server skips retraining
+ANALYSIS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "product_roadmap")
+
+# Bump whenever scoring, ROI or the cached frame layout changes so stale files are ignored
+ANALYSIS_CACHE_VERSION = 1
+
+def _analysis_cache_prefix():
+    """Filename prefix shared by every cached version of this database file"""
+    db_path = os.path.realpath(st.session_state.db_manager.db_path)
+    return hashlib.sha1(db_path.encode('utf-8')).hexdigest()[:16] + "-"
+
+def _analysis_cache_paths(db_mtime):
+    """Parquet files holding the analysis and ROI frames for one database version"""
+    stem = f"{_analysis_cache_prefix()}v{ANALYSIS_CACHE_VERSION}-{db_mtime}"
+    return (
+        os.path.join(ANALYSIS_CACHE_DIR, f"{stem}-analysis.parquet"),
+        os.path.join(ANALYSIS_CACHE_DIR, f"{stem}-roi.parquet")
+    )
+
+def _read_analysis_cache(db_mtime):
+    """Cached (analysis_df, roi_df, model_stats) for this database version, or None"""
+    analysis_path, roi_path = _analysis_cache_paths(db_mtime)
+    if not (os.path.exists(analysis_path) and os.path.exists(roi_path)):
+        return None
+    
+    try:
+        analysis_table = pq.read_table(analysis_path)
+        model_stats = json.loads(analysis_table.schema.metadata[b'model_stats'])
+        return analysis_table.to_pandas(), pd.read_parquet(roi_path), model_stats
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
+
+def _write_analysis_cache(db_mtime, analysis_df, roi_df, model_stats):
+    """Persist the scored frames for this database version and drop its older versions"""
+    analysis_path, roi_path = _analysis_cache_paths(db_mtime)
+    try:
+        os.makedirs(ANALYSIS_CACHE_DIR, exist_ok=True)
+        
+        # model_stats rides along in the schema metadata so one file restores the analysis
+        analysis_table = pa.Table.from_pandas(analysis_df, preserve_index=False)
+        analysis_table = analysis_table.replace_schema_metadata({
+            **(analysis_table.schema.metadata or {}),
+            b'model_stats': json.dumps(model_stats).encode('utf-8')
+        })
+        pq.write_table(analysis_table, analysis_path, compression='zstd')
+        roi_df.to_parquet(roi_path, compression='zstd', index=False)
+        
+        # Only prune this database's older files; other databases share the directory
+        prefix = _analysis_cache_prefix()
+        for name in os.listdir(ANALYSIS_CACHE_DIR):
+            path = os.path.join(ANALYSIS_CACHE_DIR, name)
+            if name.startswith(prefix) and path not in (analysis_path, roi_path):
+                os.remove(path)
+    except (OSError, TypeError, pa.ArrowException):
+        # The disk cache is an optimization; the in-memory result is still returned
+        pass
+
+# Shared by reference across reruns and sessions, so pages must not mutate the frames
+@st.cache_resource(ttl=300, show_spinner=True)
+def load_dashboard_data(db_mtime):
     """Load dashboard data with comprehensive error handling"""
     try:
         if 'db_manager' not in st.session_state:
@@ -259,88 +393,152 @@ def load_dashboard_data():
             raise Exception("Analytics engine not initialized")
         
         # Generate sample data if needed
-        feedback_summary = st.session_state.db_manager.get_feedback_summary()
-        if feedback_summary.empty:
+        if not _db_has_data():
             with st.spinner("🔄 Generating sample data..."):
                 st.session_state.db_manager.generate_sample_data()
+                _db_has_data.clear()
+            db_mtime = _db_mtime()
         
-        # Generate analytics
-        analysis_df, model_stats = st.session_state.analytics.generate_comprehensive_analysis()
-        roi_df = st.session_state.analytics.calculate_roi_projections(analysis_df)
-        segment_analysis, segment_priorities = st.session_state.analytics.analyze_customer_segments()
-        executive_summary = st.session_state.analytics.generate_executive_summary(analysis_df, roi_df)
+        # Generate analytics; worker threads have no script context, so bind the engine here
+        analytics = st.session_state.analytics
         
-        return {
-            'analysis_df': analysis_df,
-            'roi_df': roi_df, 
-            'segment_analysis': segment_analysis,
-            'segment_priorities': segment_priorities,
-            'executive_summary': executive_summary,
-            'model_stats': model_stats,
-            'last_updated': datetime.now()
-        }
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # Segment analysis only reads the database, so it overlaps the scoring chain below
+            segments_future = pool.submit(analytics.analyze_customer_segments)
+            
+            cached = _read_analysis_cache(db_mtime)
+            if cached is not None:
+                analysis_df, roi_df, model_stats = cached
+            else:
+                analysis_df, model_stats = analytics.generate_comprehensive_analysis()
+                
+                # Ordered categorical quarters give groupby the categorical fast path and
+                # let charts use a fixed legend order
+                analysis_df['recommended_quarter'] = pd.Categorical(
+                    analysis_df['recommended_quarter'],
+                    categories=ROADMAP_QUARTERS,
+                    ordered=True
+                )
+                
+                # Quarters are assigned by score threshold, so a stable sort keeps the ranking
+                # within each quarter and lets quarter groupbys skip their own reordering
+                analysis_df = analysis_df.sort_values(
+                    'recommended_quarter', kind='mergesort'
+                ).reset_index(drop=True)
+                roi_df = analytics.calculate_roi_projections(analysis_df)
+                _write_analysis_cache(db_mtime, analysis_df, roi_df, model_stats)
+            
+            executive_summary = analytics.generate_executive_summary(analysis_df, roi_df)
+            
+            segment_analysis, segment_priorities = segments_future.result()
+        
+        # Segment tables are only displayed, so keep them in the Arrow form st.dataframe sends
+        segment_analysis = pa.Table.from_pandas(segment_analysis, preserve_index=False)
+        segment_priorities = pa.Table.from_pandas(segment_priorities, preserve_index=False)
+        
+        return DashboardData(
+            analysis_df=analysis_df,
+            roi_df=roi_df, 
+            segment_analysis=segment_analysis,
+            segment_priorities=segment_priorities,
+            executive_summary=executive_summary,
+            model_stats=model_stats,
+            last_updated=datetime.now(),
+            # Hashed once here so page helpers can cache on an int instead of the frames
+            fingerprint=int(pd.util.hash_pandas_object(analysis_df, index=False).sum())
+        )
         
     except Exception as e:
         st.error(f"Error loading dashboard data: {str(e)}")
-        return {
-            'analysis_df': pd.DataFrame(),
-            'roi_df': pd.DataFrame(),
-            'segment_analysis': pd.DataFrame(),
-            'segment_priorities': pd.DataFrame(),
-            'executive_summary': {
+        return DashboardData(
+            analysis_df=pd.DataFrame(),
+            roi_df=pd.DataFrame(),
+            segment_analysis=pa.table({}),
+            segment_priorities=pa.table({}),
+            executive_summary={
                 'total_features': 0,
                 'high_priority_features': 0,
                 'avg_roi': 0,
                 'total_projected_revenue': 0,
                 'quick_wins': 0
             },
-            'model_stats': {'train_score': 0, 'test_score': 0},
-            'last_updated': datetime.now()
-        }
+            model_stats={'train_score': 0, 'test_score': 0},
+            last_updated=datetime.now()
+        )
 
-def show_header():
-    """Show main header"""
-    st.markdown("""
+HEADER_HTML = """
     <div class="main-header">
         <h1>🚀 Product Roadmap Platform</h1>
         <h3>AI-Driven Feature Prioritization & Strategic Planning</h3>
         <p>Make data-driven product decisions with advanced analytics and ML-powered insights</p>
     </div>
-    """, unsafe_allow_html=True)
-
-def create_metric_card(title, value, help_text=""):
-    """Create metric cards with proper dark theme styling"""
-    return f"""
-    <div class="metric-card" title="{help_text}">
-        <div class="metric-title">{title}</div>
-        <div class="metric-value">{value}</div>
-    </div>
     """
 
+def show_header():
+    """Show main header"""
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
+# Metric card markup, compiled once and filled with substitute(); kept free of
+# indentation whitespace since it is repeated for every card sent to the browser
+_METRIC_CARD_TEMPLATE = string.Template(
+    '<div class="metric-card" title="$help_text">'
+    '<div class="metric-title">$title</div>'
+    '<div class="metric-value">$value</div>'
+    '</div>'
+)
+
+# Insight card markup, compiled once and filled with substitute()
+_INSIGHT_CARD_TEMPLATE = string.Template(
+    '<div class="insight-card"><strong>$title</strong><br>'
+    '<span style="font-size: 1.5rem; font-weight: bold; color: $color;">$value</span></div>'
+)
+
+def create_card_grid(cards, columns):
+    """Lay out several cards in one grid so they render with a single st.markdown call"""
+    return (
+        f'<div style="display: grid; grid-template-columns: repeat({columns}, 1fr); gap: 1rem;">'
+        + "".join(cards)
+        + '</div>'
+    )
+
+def render_metric_cards(cards, columns):
+    """Build a grid of metric cards from (title, value, help_text) rows"""
+    return create_card_grid((
+        _METRIC_CARD_TEMPLATE.substitute(
+            title=title,
+            value=value,
+            # Help text lands in an attribute, so quotes must be escaped too
+            help_text=html.escape(help_text)
+        )
+        for title, value, help_text in cards
+    ), columns)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _kpi_row_html(cards, columns=4):
+    """KPI card grid for a tuple of (title, value, help_text) rows, memoized per input"""
+    return render_metric_cards(cards, columns)
+
 def show_sidebar():
     """Enhanced sidebar"""
     with st.sidebar:
-        st.markdown('<div class="sidebar-content">', unsafe_allow_html=True)
-        st.markdown("## 🧭 **Navigation**")
-        
-        pages = [
-            "📊 Dashboard Overview",
-            "🎯 Priority Matrix", 
-            "📅 Roadmap Timeline",
-            "💰 ROI Analysis",
-            "🤖 AI Assistant",
-            "📈 Analytics Deep Dive",
-            "👥 Customer Segments",
-            "⚙️ Data Management"
-        ]
-        
-        page = st.selectbox("Choose a page:", pages)
-        st.markdown('</div>', unsafe_allow_html=True)
+        # Keyed containers get an st-key-* class, so the card styling wraps the real widgets
+        with st.container(key="sidebar-nav"):
+            st.markdown("## 🧭 **Navigation**")
+            
+            # Navigation stays outside the fragment: switching pages must rerun the whole app
+            page = st.selectbox("Choose a page:", list(PAGES))
         
         st.markdown("---")
         
-        # Quick Actions
-        st.markdown('<div class="sidebar-content">', unsafe_allow_html=True)
+        show_sidebar_panels()
+    
+    return page
+
+@st.fragment
+def show_sidebar_panels():
+    """Sidebar actions, stats and status; button clicks here rerun only this fragment"""
+    # Quick Actions
+    with st.container(key="sidebar-actions"):
         st.markdown("## ⚡ **Quick Actions**")
         
         col1, col2 = st.columns(2)
@@ -350,294 +548,494 @@ def show_sidebar():
                 st.rerun()
         
         with col2:
-            if st.button("🤖 Train ML", use_container_width=True):
-                with st.spinner("Training..."):
-                    try:
-                        st.session_state.prioritization_engine.train_ml_prioritization_model()
-                        st.success("✅ Updated!")
-                    except Exception as e:
-                        st.error(f"❌ Error: {str(e)}")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # System Status
-        if st.session_state.dashboard_data:
-            st.markdown('<div class="sidebar-content">', unsafe_allow_html=True)
-            summary = st.session_state.dashboard_data['executive_summary']
-            
-            st.markdown("## 📈 **Quick Stats**")
-            st.metric("📋 Total Features", summary['total_features'])
-            st.metric("🔥 High Priority", summary['high_priority_features'])
-            st.metric("⚡ Quick Wins", summary['quick_wins'])
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Status indicators
-        st.markdown('<div class="sidebar-content">', unsafe_allow_html=True)
-        st.markdown("## 🔍 **System Status**")
-        
+            # An in-flight assistant query may be retraining the same engine on the worker
+            # thread. Submitting a chat prompt only reruns the assistant fragment, so this
+            # button can still look enabled; re-check at click time as well. Gate on the
+            # future itself: the key is only cleared on the assistant page
+            pending = st.session_state.get('pending_response')
+            busy = pending is not None and not pending.done()
+            if st.button(
+                "🤖 Train ML",
+                use_container_width=True,
+                disabled=busy
+            ):
+                if busy:
+                    st.warning("⏳ Wait for the assistant to finish answering.")
+                else:
+                    with st.spinner("Training..."):
+                        try:
+                            st.session_state.prioritization_engine.train_ml_prioritization_model()
+                            st.success("✅ Updated!")
+                        except Exception as e:
+                            st.error(f"❌ Error: {str(e)}")
+    
+    # System Status
+    data = st.session_state.dashboard_data
+    if data and not data.analysis_df.empty:
+        summary = data.executive_summary
+        stats = (
+            ("📋 Total Features", summary['total_features'], "Features in the scored roadmap"),
+            ("🔥 High Priority", summary['high_priority_features'], "Top 20% by composite score"),
+            ("⚡ Quick Wins", summary['quick_wins'], "Low effort, high impact features")
+        )
+    else:
+        # No scored analysis to summarize; fall back to raw counts straight from SQLite
+        summary = _db_summary(_db_mtime())
+        stats = (
+            ("📋 Requested Features", summary['total_features'], "Distinct features in customer feedback"),
+            ("📨 Total Requests", summary['total_requests'], "Feedback rows in the database"),
+            ("🔥 High/Critical Requests", summary['high_priority_requests'], "Requests marked High or Critical")
+        )
+    
+    with st.container(key="sidebar-stats"):
+        st.markdown("## 📈 **Quick Stats**")
+        # All three cards go out as one element instead of a widget per stat
+        st.markdown(_kpi_row_html(stats, 1), unsafe_allow_html=True)
+    
+    # Status indicators
+    with st.expander("🔍 System Status", expanded=False):
         try:
-            feedback_summary = st.session_state.db_manager.get_feedback_summary()
-            if not feedback_summary.empty:
+            if _db_has_data():
                 st.markdown('**Database:** <span class="status-green">🟢 Connected</span>', unsafe_allow_html=True)
             else:
                 st.markdown('**Database:** <span class="status-yellow">🟡 Empty</span>', unsafe_allow_html=True)
         except:
             st.markdown('**Database:** <span class="status-red">🔴 Error</span>', unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+
+@st.cache_data(show_spinner=False)
+def _priority_counts(scores):
+    """Bucket composite scores into priority bands; keyed on the raw score array"""
+    # Bin scores into (0, 33], (33, 66], (66, 100] without building a Categorical
+    binned = scores[(scores > 0) & (scores <= 100)]
+    counts = np.bincount(np.searchsorted([33, 66], binned), minlength=3)
+    
+    return pd.Series(counts, index=['Low Priority', 'Medium Priority', 'High Priority'])
+
+@st.cache_data(show_spinner=False)
+def _summarize_overview(fingerprint, _analysis_df):
+    """Compute every overview aggregate in one pass per data fingerprint"""
+    # analysis_df is already ranked by composite score, so head(N) is the top N
+    top10 = _analysis_df.head(10)
+    
+    return {
+        'top10': top10,
+        'top8': top10.head(8),
+        'mean_score': _analysis_df['composite_score'].mean(),
+        'top10_effort': top10['effort_estimate'].sum(),
+        # Reuse the cached per-quarter counts; they're in quarter order, so ties resolve
+        # to the earliest quarter just like mode() did
+        'popular_quarter': _quarterly_summary(fingerprint, _analysis_df)['Features'].idxmax()
+    }
+
+# Registered Plotly template carrying the dark palette, so figures don't repeat it
+PLOT_TEMPLATE = 'app_dark'
+
+def _plot_template():
+    """Register the app's dark Plotly template on first use and return its name"""
+    import plotly.io as pio
+    import plotly.graph_objects as go
+    
+    if PLOT_TEMPLATE not in pio.templates:
+        template = go.layout.Template(pio.templates['plotly_dark'])
+        template.layout.update(
+            paper_bgcolor='#0f172a',
+            plot_bgcolor='#0f172a',
+            font=dict(color='#f8fafc')
+        )
+        pio.templates[PLOT_TEMPLATE] = template
+    
+    return PLOT_TEMPLATE
+
+# Fixed palette for the priority bands, shared by reference with every pie build
+PRIORITY_COLORS = {
+    'High Priority': '#ef4444',
+    'Medium Priority': '#f59e0b',
+    'Low Priority': '#10b981'
+}
+
+# Overview charts are glanceable summaries: render them as static images with no
+# mode bar, and keep their own dark template instead of Streamlit's theme
+STATIC_CHART_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Columns shown in the overview's Feature Details table, in display order
+FEATURE_DETAIL_COLUMNS = ('feature_name', 'composite_score', 'effort_estimate', 'recommended_quarter')
+
+@st.cache_data(show_spinner=False)
+def _priority_pie_json(values, names):
+    """Build the priority distribution pie once per distinct input and cache its JSON"""
+    import plotly.io as pio
+    import plotly.graph_objects as go
+    
+    # Three fixed slices: assemble the spec directly instead of going through
+    # plotly.express, and skip property validation on a spec we control
+    fig = go.Figure({
+        'data': [{
+            'type': 'pie',
+            'values': list(values),
+            'labels': list(names),
+            'marker': {'colors': [PRIORITY_COLORS[name] for name in names]},
+            'hole': 0.4,
+            'hovertemplate': "label=%{label}<br>value=%{value}<extra></extra>"
+        }],
+        'layout': {
+            # Unvalidated layouts don't resolve template names, so pass the object
+            'template': pio.templates[_plot_template()],
+            'height': 350,
+            'legend': {'tracegroupgap': 0},
+            'margin': {'t': 60}
+        }
+    }, _validate=False)
     
-    return page
+    return fig.to_json()
+
+def _require_df(key, empty_message):
+    """Return (dashboard_data, frame), or warn/inform and return (None, None) if it can't be shown"""
+    # One session_state lookup; callers read the fingerprint off the returned data
+    data = st.session_state.dashboard_data
+    if not data:
+        st.warning("⚠️ Dashboard data not loaded.")
+        return None, None
+    
+    df = getattr(data, key)
+    # len() covers both pandas frames and Arrow tables
+    if len(df) == 0:
+        st.info(empty_message)
+        return None, None
+    
+    return data, df
 
 def show_dashboard_overview():
     """Dashboard overview with fixed styling"""
     st.title("📊 Dashboard Overview")
     
-    if not st.session_state.dashboard_data:
+    data = st.session_state.dashboard_data
+    if not data:
         st.warning("⚠️ Dashboard data not loaded. Please refresh the page.")
         return
     
-    data = st.session_state.dashboard_data
-    summary = data['executive_summary']
-    analysis_df = data['analysis_df']
+    summary = data.executive_summary
+    analysis_df = data.analysis_df
     
     # Key Metrics
     st.markdown("### 🎯 **Key Performance Indicators**")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown(create_metric_card(
-            "Total Features",
-            summary['total_features'],
-            "Total number of features in the roadmap"
-        ), unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(create_metric_card(
-            "High Priority",
-            summary['high_priority_features'],
-            "Features with high priority scores"
-        ), unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(create_metric_card(
-            "Quick Wins",
-            summary['quick_wins'],
-            "Low effort, high impact features"
-        ), unsafe_allow_html=True)
-    
-    with col4:
-        if summary['avg_roi'] > 0:
-            st.markdown(create_metric_card(
-                "Average ROI",
-                f"{summary['avg_roi']:.1f}%",
-                "Average return on investment"
-            ), unsafe_allow_html=True)
-        else:
-            model_score = data['model_stats']['train_score']
-            st.markdown(create_metric_card(
-                "ML Model Score",
-                f"{model_score:.2f}",
-                "Machine learning model accuracy"
-            ), unsafe_allow_html=True)
+    if summary['avg_roi'] > 0:
+        last_card = (
+            "Average ROI",
+            f"{summary['avg_roi']:.1f}%",
+            "Average return on investment"
+        )
+    else:
+        model_score = data.model_stats['train_score']
+        last_card = (
+            "ML Model Score",
+            f"{model_score:.2f}",
+            "Machine learning model accuracy"
+        )
+    
+    st.markdown(_kpi_row_html((
+        ("Total Features", summary['total_features'], "Total number of features in the roadmap"),
+        ("High Priority", summary['high_priority_features'], "Features with high priority scores"),
+        ("Quick Wins", summary['quick_wins'], "Low effort, high impact features"),
+        last_card
+    )), unsafe_allow_html=True)
     
     # Charts
     if not analysis_df.empty:
-        col1, col2 = st.columns(2)
+        overview = _summarize_overview(data.fingerprint, analysis_df)
         
-        with col1:
-            st.markdown("### 🎯 **Priority Distribution**")
-            
-            analysis_df['priority_category'] = pd.cut(
-                analysis_df['composite_score'], 
-                bins=[0, 33, 66, 100], 
-                labels=['Low Priority', 'Medium Priority', 'High Priority']
-            )
-            
-            priority_counts = analysis_df['priority_category'].value_counts()
-            
-            fig = px.pie(
-                values=priority_counts.values,
-                names=priority_counts.index,
-                color_discrete_map={
-                    'High Priority': '#ef4444',
-                    'Medium Priority': '#f59e0b', 
-                    'Low Priority': '#10b981'
-                },
-                hole=0.4
-            )
-            
-            # Apply dark theme to chart
-            fig.update_layout(
-                template='plotly_dark',
-                paper_bgcolor='#0f172a',
-                plot_bgcolor='#0f172a',
-                font=dict(color='#f8fafc'),
-                height=350
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        # With on_change="rerun" tabs run lazily: only the open tab builds and ships its figure
+        dist_tab, top_tab = st.tabs(
+            ["🎯 Priority Distribution", "🏆 Top Priority Features"],
+            key='overview_charts',
+            on_change='rerun'
+        )
         
-        with col2:
-            st.markdown("### 🏆 **Top Priority Features**")
-            
-            top_features = analysis_df.head(8)
-            
-            fig = go.Figure(go.Bar(
-                x=top_features['composite_score'],
-                y=top_features['feature_name'],
-                orientation='h',
-                marker_color='#60a5fa'
-            ))
-            
-            fig.update_layout(
-                template='plotly_dark',
-                paper_bgcolor='#0f172a',
-                plot_bgcolor='#0f172a',
-                font=dict(color='#f8fafc'),
-                height=350,
-                xaxis_title="Priority Score",
-                yaxis_title=""
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        if dist_tab.open:
+            with dist_tab:
+                # A plain float array hashes far cheaper than the whole frame
+                priority_counts = _priority_counts(analysis_df['composite_score'].to_numpy())
+                
+                pie_json = _priority_pie_json(
+                    tuple(priority_counts.values.tolist()),
+                    tuple(priority_counts.index)
+                )
+                st.plotly_chart(
+                    json.loads(pie_json),
+                    use_container_width=True,
+                    theme=None,
+                    config=STATIC_CHART_CONFIG,
+                    key='priority_pie'
+                )
+        
+        if top_tab.open:
+            with top_tab:
+                top_features = overview['top8']
+                
+                # Eight inline bars render natively in the grid; no Plotly spec to ship
+                st.dataframe(
+                    top_features,
+                    column_order=['feature_name', 'composite_score'],
+                    column_config={
+                        'feature_name': st.column_config.TextColumn('Feature'),
+                        'composite_score': st.column_config.ProgressColumn(
+                            'Priority Score',
+                            min_value=0,
+                            max_value=float(top_features['composite_score'].max()),
+                            format='%.1f'
+                        )
+                    },
+                    hide_index=True,
+                    use_container_width=True,
+                    height=350
+                )
         
         # Feature Details Table
         st.markdown("### 📋 **Feature Details**")
         
-        display_df = analysis_df.head(10)[
-            ['feature_name', 'composite_score', 'effort_estimate', 'recommended_quarter']
-        ].copy()
-        
-        display_df.columns = ['🎯 Feature Name', '📊 Priority Score', '⚙️ Effort (SP)', '📅 Quarter']
-        display_df['📊 Priority Score'] = display_df['📊 Priority Score'].round(2)
-        
-        st.dataframe(display_df, use_container_width=True)
+        st.dataframe(
+            overview['top10'],
+            column_order=FEATURE_DETAIL_COLUMNS,
+            column_config={
+                'feature_name': st.column_config.TextColumn('🎯 Feature Name', width='large'),
+                'composite_score': st.column_config.NumberColumn('📊 Priority Score', format='%.2f'),
+                'effort_estimate': st.column_config.NumberColumn('⚙️ Effort (SP)'),
+                'recommended_quarter': st.column_config.TextColumn('📅 Quarter')
+            },
+            use_container_width=True
+        )
         
         # Insights
         st.markdown("### 💡 **Key Insights**")
         
-        col1, col2, col3 = st.columns(3)
+        avg_score = overview['mean_score']
+        total_effort = overview['top10_effort']
+        popular_quarter = overview['popular_quarter']
         
-        with col1:
-            avg_score = analysis_df['composite_score'].mean()
-            st.markdown(f"""
-            <div class="insight-card">
-                <strong>📈 Average Priority Score</strong><br>
-                <span style="font-size: 1.5rem; font-weight: bold; color: #60a5fa;">{avg_score:.1f}</span>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(create_card_grid([
+            _INSIGHT_CARD_TEMPLATE.substitute(
+                title="📈 Average Priority Score", color="#60a5fa", value=f"{avg_score:.1f}"
+            ),
+            _INSIGHT_CARD_TEMPLATE.substitute(
+                title="⚙️ Total Effort (Top 10)", color="#fbbf24", value=f"{total_effort:.0f} SP"
+            ),
+            _INSIGHT_CARD_TEMPLATE.substitute(
+                title="📅 Most Popular Quarter", color="#34d399", value=popular_quarter
+            )
+        ], 3), unsafe_allow_html=True)
+
+# Above this many features the priority matrix switches to a density heatmap
+PRIORITY_MATRIX_MAX_POINTS = 5000
+
+# Below this many features the effort/impact medians can't split four quadrants
+PRIORITY_MATRIX_MIN_POINTS = 4
+
+# Only these columns are handed to Plotly, so the figure spec stays small
+PRIORITY_MATRIX_COLUMNS = ['effort_estimate', 'impact_score', 'composite_score', 'recommended_quarter', 'feature_name']
+
+# Shared by reference, so the figure is fully themed here and never mutated by callers
+@st.cache_resource(show_spinner=False)
+def _priority_matrix_fig(fingerprint, _analysis_df):
+    """Build the themed effort vs impact figure once per data fingerprint"""
+    # Plotly is imported lazily so non-chart pages don't pay for it on cold start
+    import plotly.graph_objects as go
+    
+    # Projected here so cache hits don't copy the frame
+    plot_df = _analysis_df[PRIORITY_MATRIX_COLUMNS]
+    
+    if len(plot_df) > PRIORITY_MATRIX_MAX_POINTS:
+        import plotly.express as px
         
-        with col2:
-            total_effort = analysis_df.head(10)['effort_estimate'].sum()
-            st.markdown(f"""
-            <div class="insight-card">
-                <strong>⚙️ Total Effort (Top 10)</strong><br>
-                <span style="font-size: 1.5rem; font-weight: bold; color: #fbbf24;">{total_effort:.0f} SP</span>
-            </div>
-            """, unsafe_allow_html=True)
+        # Too many markers to draw individually; show point density instead
+        fig = px.density_heatmap(
+            plot_df,
+            x='effort_estimate',
+            y='impact_score',
+            nbinsx=60,
+            nbinsy=60,
+            title="Feature Priority Matrix"
+        )
+        return _apply_matrix_theme(fig)
+    
+    # Raw arrays straight into Scattergl, skipping plotly.express' frame processing
+    efforts = plot_df['effort_estimate'].to_numpy()
+    impacts = plot_df['impact_score'].to_numpy()
+    scores = plot_df['composite_score'].to_numpy()
+    names = plot_df['feature_name'].to_numpy(dtype=object)
+    quarter_codes = plot_df['recommended_quarter'].cat.codes.to_numpy()
+    
+    # Same area scaling plotly.express uses for size= (largest marker 20px)
+    sizes = np.clip(scores, 0, None)
+    max_size = sizes.max()
+    size_ref = max_size / 20 ** 2 if max_size > 0 else 1
+    
+    fig = go.Figure()
+    
+    # One trace per quarter keeps the quarter legend
+    for code, quarter in enumerate(ROADMAP_QUARTERS):
+        mask = quarter_codes == code
+        if not mask.any():
+            continue
         
-        with col3:
-            popular_quarter = analysis_df['recommended_quarter'].mode().iloc[0]
-            st.markdown(f"""
-            <div class="insight-card">
-                <strong>📅 Most Popular Quarter</strong><br>
-                <span style="font-size: 1.5rem; font-weight: bold; color: #34d399;">{popular_quarter}</span>
-            </div>
-            """, unsafe_allow_html=True)
+        fig.add_trace(go.Scattergl(
+            x=efforts[mask],
+            y=impacts[mask],
+            mode='markers',
+            name=quarter,
+            text=names[mask],
+            customdata=scores[mask],
+            marker=dict(size=sizes[mask], sizemode='area', sizeref=size_ref),
+            hovertemplate=(
+                "<b>%{text}</b><br>effort_estimate=%{x}<br>"
+                "impact_score=%{y}<br>composite_score=%{customdata}<extra></extra>"
+            )
+        ))
+    
+    fig.update_layout(
+        title="Feature Priority Matrix",
+        xaxis_title='effort_estimate',
+        yaxis_title='impact_score',
+        legend_title_text='recommended_quarter'
+    )
+    
+    return _apply_matrix_theme(fig)
+
+def _apply_matrix_theme(fig):
+    """Dark theme plus a fixed uirevision so pan/zoom survives reruns"""
+    fig.update_layout(
+        template=_plot_template(),
+        height=600,
+        uirevision='priority'
+    )
+    return fig
 
 def show_priority_matrix():
     """Priority matrix with dark theme"""
     st.title("🎯 Priority Matrix")
     
-    if not st.session_state.dashboard_data:
-        st.warning("⚠️ Dashboard data not loaded.")
+    data, analysis_df = _require_df('analysis_df', "📊 No data available for priority matrix.")
+    if data is None:
         return
     
-    analysis_df = st.session_state.dashboard_data['analysis_df']
-    
-    if analysis_df.empty:
-        st.info("📊 No data available for priority matrix.")
+    if len(analysis_df) < PRIORITY_MATRIX_MIN_POINTS:
+        st.info(f"📊 Need at least {PRIORITY_MATRIX_MIN_POINTS} features for quadrant analysis.")
         return
     
     st.markdown("### 📊 **Effort vs Impact Analysis**")
     
-    fig = px.scatter(
-        analysis_df,
-        x='effort_estimate',
-        y='impact_score',
-        size='composite_score',
-        color='recommended_quarter',
-        hover_name='feature_name',
-        title="Feature Priority Matrix",
-        template='plotly_dark'
-    )
-    
-    fig.update_layout(
-        paper_bgcolor='#0f172a',
-        plot_bgcolor='#0f172a',
-        font=dict(color='#f8fafc'),
-        height=600
-    )
+    # A stable key lets the frontend update the existing plot instead of recreating it
+    fig = _priority_matrix_fig(data.fingerprint, analysis_df)
+    st.plotly_chart(fig, use_container_width=True, key='priority_matrix')
+
+@st.cache_data(show_spinner=False)
+def _quarterly_summary(fingerprint, _analysis_df):
+    """Per-quarter feature count, effort and priority, memoized per data fingerprint"""
+    quarterly_data = _analysis_df.groupby('recommended_quarter', sort=False, observed=True).agg({
+        'feature_name': 'count',
+        'effort_estimate': 'sum',
+        'composite_score': 'mean'
+    }).round(2)
     
-    st.plotly_chart(fig, use_container_width=True)
+    quarterly_data.columns = ['Features', 'Total Effort', 'Avg Priority']
+    return quarterly_data
+
+@st.cache_data(show_spinner=False)
+def _quarterly_summary_table(fingerprint, _analysis_df):
+    """Quarterly summary as Arrow, converted once per data fingerprint for st.dataframe"""
+    return pa.Table.from_pandas(_quarterly_summary(fingerprint, _analysis_df), preserve_index=True)
 
 def show_roadmap_timeline():
     """Roadmap timeline with dark theme"""
     st.title("📅 Roadmap Timeline")
     
-    if not st.session_state.dashboard_data:
-        st.warning("⚠️ Dashboard data not loaded.")
-        return
-    
-    analysis_df = st.session_state.dashboard_data['analysis_df']
-    
-    if analysis_df.empty:
-        st.info("📊 No data available for timeline.")
+    data, analysis_df = _require_df('analysis_df', "📊 No data available for timeline.")
+    if data is None:
         return
     
     st.markdown("### 🗓️ **Quarterly Roadmap Overview**")
     
-    quarterly_data = analysis_df.groupby('recommended_quarter').agg({
-        'feature_name': 'count',
-        'effort_estimate': 'sum',
-        'composite_score': 'mean'
-    }).round(2)
-    
-    quarterly_data.columns = ['Features', 'Total Effort', 'Avg Priority']
-    st.dataframe(quarterly_data, use_container_width=True)
+    st.dataframe(_quarterly_summary_table(data.fingerprint, analysis_df), use_container_width=True)
+
+@st.cache_data(show_spinner=False)
+def _roi_totals(fingerprint, _roi_df):
+    """Portfolio investment, revenue and average ROI, memoized per data fingerprint"""
+    # One column-wise reduction over a single float block instead of three pandas passes
+    values = _roi_df[
+        ['development_cost', 'projected_annual_revenue', 'roi_percentage']
+    ].to_numpy(dtype=float)
+    total_investment, total_revenue, roi_sum = values.sum(axis=0)
+    
+    return {
+        'total_investment': total_investment,
+        'total_revenue': total_revenue,
+        'avg_roi': roi_sum / len(values)
+    }
 
 def show_roi_analysis():
     """ROI analysis with dark theme"""
     st.title("💰 ROI Analysis")
     
-    if not st.session_state.dashboard_data:
-        st.warning("⚠️ Dashboard data not loaded.")
-        return
-    
-    roi_df = st.session_state.dashboard_data['roi_df']
-    
-    if roi_df.empty:
-        st.info("📊 No ROI data available.")
+    data, roi_df = _require_df('roi_df', "📊 No ROI data available.")
+    if data is None:
         return
     
     st.markdown("### 💼 **ROI Overview**")
     
+    totals = _roi_totals(data.fingerprint, roi_df)
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        total_investment = roi_df['development_cost'].sum()
-        st.metric("Total Investment", f"${total_investment:,.0f}")
+        st.metric("Total Investment", f"${totals['total_investment']:,.0f}")
     
     with col2:
-        total_revenue = roi_df['projected_annual_revenue'].sum()
-        st.metric("Projected Revenue", f"${total_revenue:,.0f}")
+        st.metric("Projected Revenue", f"${totals['total_revenue']:,.0f}")
     
     with col3:
-        avg_roi = roi_df['roi_percentage'].mean()
-        st.metric("Average ROI", f"{avg_roi:.1f}%")
+        st.metric("Average ROI", f"{totals['avg_roi']:.1f}%")
+
+@st.cache_resource
+def _assistant_executor():
+    """Shared worker pool that runs assistant queries off the script thread"""
+    return ThreadPoolExecutor(max_workers=2)
 
+@st.fragment(run_every=0.5)
+def _show_pending_response():
+    """Poll the in-flight assistant query and post its answer once it finishes"""
+    future = st.session_state.get('pending_response')
+    if future is None:
+        return
+    
+    if not future.done():
+        with st.chat_message("assistant"):
+            st.write("🤔 Thinking...")
+        return
+    
+    del st.session_state.pending_response
+    try:
+        response = future.result()
+    except Exception as e:
+        response = f"Sorry, I encountered an error: {str(e)}"
+    
+    push_chat("assistant", response)
+    st.rerun()
+
+def _submit_chat_prompt():
+    """Record the user's prompt and start answering it in the background"""
+    prompt = st.session_state.chat_prompt
+    push_chat("user", prompt)
+    st.session_state.pending_response = _assistant_executor().submit(
+        st.session_state.ai_assistant.process_query, prompt
+    )
+
+def _render_chat(messages):
+    """Draw chat messages with Streamlit's native chat elements"""
+    # Consecutive messages from one role share a bubble, so each run is a single element
+    for role, run in groupby(messages, key=lambda message: message["role"]):
+        with st.chat_message(role):
+            st.write("\n\n".join(message["content"] for message in run))
+
+@st.fragment
 def show_ai_assistant():
     """AI Assistant with dark theme"""
     st.title("🤖 AI Product Assistant")
@@ -645,36 +1043,40 @@ def show_ai_assistant():
     st.info("💡 Ask me anything about your product roadmap!")
     
     # Display chat messages
-    for message in st.session_state.chat_messages:
-        with st.chat_message(message["role"]):
-            st.write(message["content"])
-    
-    # Chat input
-    if prompt := st.chat_input("Ask about your roadmap..."):
-        st.session_state.chat_messages.append({"role": "user", "content": prompt})
-        
-        with st.chat_message("user"):
-            st.write(prompt)
-        
-        with st.chat_message("assistant"):
-            try:
-                response = st.session_state.ai_assistant.process_query(prompt)
-                st.write(response)
-                st.session_state.chat_messages.append({"role": "assistant", "content": response})
-            except Exception as e:
-                error_msg = f"Sorry, I encountered an error: {str(e)}"
-                st.error(error_msg)
-                st.session_state.chat_messages.append({"role": "assistant", "content": error_msg})
+    messages = st.session_state.chat_messages
+    older = len(messages) - CHAT_INLINE_MESSAGES
+    if older > 0:
+        # Lazy expander: older messages are only rendered while it is open
+        history = st.expander(f"📜 Show {older} older messages", key='chat_history', on_change='rerun')
+        if history.open:
+            with history:
+                _render_chat(islice(messages, older))
+    
+    _render_chat(islice(messages, max(older, 0), None))
+    
+    # Only poll while a query is running; a full rerun without this call stops the timer
+    pending = 'pending_response' in st.session_state
+    if pending:
+        _show_pending_response()
+    
+    # Chat input; the submit callback runs before the rerun that redraws this fragment
+    st.chat_input(
+        "Ask about your roadmap...",
+        key='chat_prompt',
+        on_submit=_submit_chat_prompt,
+        disabled=pending
+    )
 
 def show_analytics_deep_dive():
     """Analytics deep dive"""
     st.title("📈 Analytics Deep Dive")
     
-    if not st.session_state.dashboard_data:
+    data = st.session_state.dashboard_data
+    if not data:
         st.warning("⚠️ Dashboard data not loaded.")
         return
     
-    model_stats = st.session_state.dashboard_data['model_stats']
+    model_stats = data.model_stats
     
     st.markdown("### 🤖 **ML Model Performance**")
     
@@ -690,19 +1092,32 @@ def show_customer_segments():
     """Customer segments analysis"""
     st.title("👥 Customer Segments")
     
-    if not st.session_state.dashboard_data:
-        st.warning("⚠️ Dashboard data not loaded.")
-        return
-    
-    segment_priorities = st.session_state.dashboard_data['segment_priorities']
-    
-    if segment_priorities.empty:
-        st.info("📊 No customer segment data available.")
+    _, segment_priorities = _require_df('segment_priorities', "📊 No customer segment data available.")
+    if segment_priorities is None:
         return
     
     st.markdown("### 🎯 **Customer Segment Priorities**")
-    st.dataframe(segment_priorities, use_container_width=True)
+    
+    # Formatting happens in the grid via column_config, so no per-row strings are built here
+    st.dataframe(
+        segment_priorities,
+        column_config={
+            'customer_segment': st.column_config.TextColumn('👥 Segment'),
+            'request_count': st.column_config.NumberColumn('📨 Requests', format='%d'),
+            'avg_revenue_impact': st.column_config.NumberColumn('💰 Avg Revenue Impact', format='$%.0f'),
+            'avg_business_value': st.column_config.NumberColumn('📈 Business Value', format='%.1f/10'),
+            'segment_priority_score': st.column_config.NumberColumn('🎯 Priority Score', format='%.1f')
+        },
+        hide_index=True,
+        use_container_width=True
+    )
 
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(fingerprint, _df):
+    """Serialize a frame to CSV once per data fingerprint for the download button"""
+    return _df.to_csv(index=False).encode('utf-8')
+
+@st.fragment
 def show_data_management():
     """Data management page"""
     st.title("⚙️ Data Management")
@@ -718,6 +1133,7 @@ def show_data_management():
             with st.spinner("Generating sample data..."):
                 try:
                     st.session_state.db_manager.generate_sample_data()
+                    _db_has_data.clear()
                     st.session_state.dashboard_data = None
                     st.success("✅ Sample data generated!")
                     st.rerun()
@@ -727,11 +1143,12 @@ def show_data_management():
     with col2:
         st.markdown("#### 📤 **Data Export**")
         
-        if st.session_state.dashboard_data:
-            analysis_df = st.session_state.dashboard_data['analysis_df']
+        data = st.session_state.dashboard_data
+        if data:
+            analysis_df = data.analysis_df
             
             if not analysis_df.empty:
-                csv = analysis_df.to_csv(index=False)
+                csv = _to_csv_bytes(data.fingerprint, analysis_df)
                 
                 st.download_button(
                     label="📄 Download Analysis Data",
@@ -741,21 +1158,35 @@ def show_data_management():
                     use_container_width=True
                 )
 
-def show_footer():
-    """Enhanced footer"""
-    st.markdown("""
+FOOTER_HTML = """
     <div class="footer">
         <h3>🚀 Product Roadmap Platform</h3>
         <p><strong>AI-Driven Feature Prioritization & Strategic Planning</strong></p>
         <p>Built with ❤️ using Streamlit • Machine Learning • Advanced Analytics</p>
         <p><small>© 2025 Product Roadmap Platform. All rights reserved.</small></p>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+def show_footer():
+    """Enhanced footer"""
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+
+# Sidebar label -> page renderer, in navigation order
+PAGES = {
+    "📊 Dashboard Overview": show_dashboard_overview,
+    "🎯 Priority Matrix": show_priority_matrix,
+    "📅 Roadmap Timeline": show_roadmap_timeline,
+    "💰 ROI Analysis": show_roi_analysis,
+    "🤖 AI Assistant": show_ai_assistant,
+    "📈 Analytics Deep Dive": show_analytics_deep_dive,
+    "👥 Customer Segments": show_customer_segments,
+    "⚙️ Data Management": show_data_management
+}
 
 def main():
     """Main application function"""
     # Apply dark theme CSS
-    st.markdown(get_dark_theme_css(), unsafe_allow_html=True)
+    inject_theme_css()
     
     # Initialize session state
     if not initialize_session_state():
@@ -764,7 +1195,7 @@ def main():
     # Load dashboard data
     if st.session_state.dashboard_data is None:
         with st.spinner("🔄 Loading dashboard data..."):
-            st.session_state.dashboard_data = load_dashboard_data()
+            st.session_state.dashboard_data = load_dashboard_data(_db_mtime())
     
     # Show header
     show_header()
@@ -774,22 +1205,9 @@ def main():
     
     # Route to appropriate page
     try:
-        if selected_page == "📊 Dashboard Overview":
-            show_dashboard_overview()
-        elif selected_page == "🎯 Priority Matrix":
-            show_priority_matrix()
-        elif selected_page == "📅 Roadmap Timeline":
-            show_roadmap_timeline()
-        elif selected_page == "💰 ROI Analysis":
-            show_roi_analysis()
-        elif selected_page == "🤖 AI Assistant":
-            show_ai_assistant()
-        elif selected_page == "📈 Analytics Deep Dive":
-            show_analytics_deep_dive()
-        elif selected_page == "👥 Customer Segments":
-            show_customer_segments()
-        elif selected_page == "⚙️ Data Management":
-            show_data_management()
+        page_handler = PAGES.get(selected_page)
+        if page_handler:
+            page_handler()
         else:
             st.error(f"❌ Unknown page: {selected_page}")
             
@@ -803,6 +1221,9 @@ def main():
     # Show footer
     show_footer()
 
+# Session state cleared by "Reset Session"; engines and the database manager are kept
+RESETTABLE_KEYS = {'_init_done', 'dashboard_data', 'chat_messages', 'pending_response'}
+
 # Main execution
 if __name__ == "__main__":
     try:
@@ -812,7 +1233,7 @@ if __name__ == "__main__":
         st.info("🔄 Please refresh the page.")
         
         if st.button("🆘 Reset Session"):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
+            for key in RESETTABLE_KEYS & st.session_state.keys():
+                st.session_state.pop(key, None)
             st.success("✅ Session reset. Please refresh.")
 
@@ -91,9 +91,17 @@ class ProductAIAssistant:
             response = f"## 🏆 Top Priority Features\n\n"
             response += f"*Based on composite scoring (RICE + ML analysis)*\n\n"
             
-            for i, (_, feature) in enumerate(top_features.iterrows(), 1):
-                response += f"**{i}. {feature['feature_name']}**\n"
-                response += f"   - Score: {feature['composite_score']:.2f} | Effort: {feature['effort_estimate']:.0f}SP | Quarter: {feature['recommended_quarter']}\n\n"
+            # Build the whole list in one join over column arrays instead of iterrows()
+            response += "".join(
+                f"**{i}. {name}**\n"
+                f"   - Score: {score:.2f} | Effort: {effort:.0f}SP | Quarter: {quarter}\n\n"
+                for i, (name, score, effort, quarter) in enumerate(zip(
+                    top_features['feature_name'].to_numpy(),
+                    top_features['composite_score'].to_numpy(),
+                    top_features['effort_estimate'].to_numpy(),
+                    top_features['recommended_quarter'].to_numpy()
+                ), 1)
+            )
             
             # Add summary insights
             response += f"**Key Insights:**\n"
@@ -116,11 +124,23 @@ class ProductAIAssistant:
             if not quarter_features.empty:
                 response += f"**Features planned for {quarter}:**\n\n"
                 
-                for i, (_, feature) in enumerate(quarter_features.head(10).iterrows(), 1):
-                    response += f"{i}. **{feature['feature_name']}**\n"
-                    response += f"   - Priority Score: {feature['composite_score']:.2f}\n"
-                    response += f"   - Effort: {feature['effort_estimate']:.0f} story points\n"
-                    response += f"   - Business Impact: {feature.get('business_impact_score', 0):.1f}/100\n\n"
+                top_quarter = quarter_features.head(10)
+                impacts = (
+                    top_quarter['business_impact_score'].to_numpy()
+                    if 'business_impact_score' in top_quarter else np.zeros(len(top_quarter))
+                )
+                response += "".join(
+                    f"{i}. **{name}**\n"
+                    f"   - Priority Score: {score:.2f}\n"
+                    f"   - Effort: {effort:.0f} story points\n"
+                    f"   - Business Impact: {impact:.1f}/100\n\n"
+                    for i, (name, score, effort, impact) in enumerate(zip(
+                        top_quarter['feature_name'].to_numpy(),
+                        top_quarter['composite_score'].to_numpy(),
+                        top_quarter['effort_estimate'].to_numpy(),
+                        impacts
+                    ), 1)
+                )
                 
                 response += f"**{quarter} Summary:**\n"
                 response += f"- Total features: {len(quarter_features)}\n"
@@ -143,11 +163,18 @@ class ProductAIAssistant:
             
             response = f"## 🗓️ Complete Roadmap Timeline\n\n"
             
-            for quarter, data in timeline_summary.iterrows():
-                response += f"**{quarter}:**\n"
-                response += f"- Features: {data['feature_name']}\n"
-                response += f"- Total Effort: {data['effort_estimate']:.0f} story points\n"
-                response += f"- Avg Priority: {data['composite_score']:.2f}\n\n"
+            response += "".join(
+                f"**{quarter}:**\n"
+                f"- Features: {count}\n"
+                f"- Total Effort: {effort:.0f} story points\n"
+                f"- Avg Priority: {score:.2f}\n\n"
+                for quarter, count, effort, score in zip(
+                    timeline_summary.index,
+                    timeline_summary['feature_name'].to_numpy(),
+                    timeline_summary['effort_estimate'].to_numpy(),
+                    timeline_summary['composite_score'].to_numpy()
+                )
+            )
             
             response += f"**Timeline Insights:**\n"
             response += f"- Total roadmap span: 4 quarters\n"
@@ -177,12 +204,20 @@ class ProductAIAssistant:
         best_roi = roi_df.nlargest(5, 'roi_percentage')
         
         response += f"**🏆 Highest ROI Features:**\n\n"
-        for i, (_, feature) in enumerate(best_roi.iterrows(), 1):
-            response += f"{i}. **{feature['feature_name']}**\n"
-            response += f"   - ROI: {feature['roi_percentage']:.1f}%\n"
-            response += f"   - Investment: ${feature['development_cost']:,.0f}\n"
-            response += f"   - Projected Revenue: ${feature['projected_annual_revenue']:,.0f}\n"
-            response += f"   - Payback: {feature['payback_months']:.1f} months\n\n"
+        response += "".join(
+            f"{i}. **{name}**\n"
+            f"   - ROI: {roi:.1f}%\n"
+            f"   - Investment: ${cost:,.0f}\n"
+            f"   - Projected Revenue: ${revenue:,.0f}\n"
+            f"   - Payback: {payback:.1f} months\n\n"
+            for i, (name, roi, cost, revenue, payback) in enumerate(zip(
+                best_roi['feature_name'].to_numpy(),
+                best_roi['roi_percentage'].to_numpy(),
+                best_roi['development_cost'].to_numpy(),
+                best_roi['projected_annual_revenue'].to_numpy(),
+                best_roi['payback_months'].to_numpy()
+            ), 1)
+        )
         
         # Risk assessment
         high_risk_features = roi_df[roi_df['risk_score'] > 60]
@@ -211,8 +246,16 @@ class ProductAIAssistant:
         response += "| Feature | Priority Rank | Composite Score | Effort (SP) | Quarter |\n"
         response += "|---------|---------------|-----------------|-------------|----------|\n"
         
-        for _, feature in comparison_data.iterrows():
-            response += f"| {feature['feature_name'][:25]}... | #{feature['priority_rank']:.0f} | {feature['composite_score']:.2f} | {feature['effort_estimate']:.0f} | {feature['recommended_quarter']} |\n"
+        response += "".join(
+            f"| {name[:25]}... | #{rank:.0f} | {score:.2f} | {effort:.0f} | {quarter} |\n"
+            for name, rank, score, effort, quarter in zip(
+                comparison_data['feature_name'].to_numpy(),
+                comparison_data['priority_rank'].to_numpy(),
+                comparison_data['composite_score'].to_numpy(),
+                comparison_data['effort_estimate'].to_numpy(),
+                comparison_data['recommended_quarter'].to_numpy()
+            )
+        )
         
         # Winner analysis
         winner = comparison_data.loc[comparison_data['composite_score'].idxmax()]
@@ -231,21 +274,34 @@ class ProductAIAssistant:
         response = f"## 👥 Team Capacity Analysis\n\n"
         
         # Quarterly breakdown
-        for _, quarter_data in capacity_analysis.iterrows():
-            response += f"**{quarter_data['quarter']}:**\n"
-            response += f"- Features: {quarter_data['feature_count']}\n"
-            response += f"- Total Effort: {quarter_data['total_effort']} story points\n"
-            response += f"- Recommendation: {quarter_data['recommended_capacity']}\n\n"
+        response += "".join(
+            f"**{quarter}:**\n"
+            f"- Features: {count}\n"
+            f"- Total Effort: {effort} story points\n"
+            f"- Recommendation: {recommendation}\n\n"
+            for quarter, count, effort, recommendation in zip(
+                capacity_analysis['quarter'].to_numpy(),
+                capacity_analysis['feature_count'].to_numpy(),
+                capacity_analysis['total_effort'].to_numpy(),
+                capacity_analysis['recommended_capacity'].to_numpy()
+            )
+        )
         
         # Team assignment analysis
-        team_analysis = df.groupby(df.apply(lambda x: self.analytics._assign_team(x), axis=1)).agg({
+        team_analysis = df.groupby(self.analytics._assign_teams(df['feature_name'])).agg({
             'effort_estimate': 'sum',
             'feature_name': 'count'
         })
         
         response += f"**Team Workload Distribution:**\n"
-        for team, data in team_analysis.iterrows():
-            response += f"- **{team}:** {data['feature_name']} features, {data['effort_estimate']:.0f} story points\n"
+        response += "".join(
+            f"- **{team}:** {count} features, {effort:.0f} story points\n"
+            for team, count, effort in zip(
+                team_analysis.index,
+                team_analysis['feature_name'].to_numpy(),
+                team_analysis['effort_estimate'].to_numpy()
+            )
+        )
         
         # Capacity recommendations
         total_effort = df['effort_estimate'].sum()
@@ -273,11 +329,18 @@ class ProductAIAssistant:
         high_risk = df.nlargest(5, 'risk_score')
         
         response += f"**🔴 Highest Risk Features:**\n\n"
-        for i, (_, feature) in enumerate(high_risk.iterrows(), 1):
-            response += f"{i}. **{feature['feature_name']}**\n"
-            response += f"   - Risk Score: {feature['risk_score']:.0f}/100\n"
-            response += f"   - Effort: {feature['effort_estimate']:.0f} SP\n"
-            response += f"   - Confidence: {feature['confidence_score']:.1%}\n\n"
+        response += "".join(
+            f"{i}. **{name}**\n"
+            f"   - Risk Score: {risk:.0f}/100\n"
+            f"   - Effort: {effort:.0f} SP\n"
+            f"   - Confidence: {confidence:.1%}\n\n"
+            for i, (name, risk, effort, confidence) in enumerate(zip(
+                high_risk['feature_name'].to_numpy(),
+                high_risk['risk_score'].to_numpy(),
+                high_risk['effort_estimate'].to_numpy(),
+                high_risk['confidence_score'].to_numpy()
+            ), 1)
+        )
         
         # Risk categories
         technical_risks = df[df['effort_estimate'] > df['effort_estimate'].quantile(0.8)]
@@ -364,8 +427,9 @@ class ProductAIAssistant:
                 mask = ~modified_df['feature_name'].str.contains(feature, case=False, na=False)
                 modified_df = modified_df[mask]
         
-        # Recalculate rankings
-        modified_df = modified_df.sort_values('composite_score', ascending=False)
+        # Recalculate rankings; positional take skips the label-based sort machinery
+        order = np.argsort(-modified_df['composite_score'].to_numpy(), kind='stable')
+        modified_df = modified_df.take(order)
         modified_df['priority_rank'] = range(1, len(modified_df) + 1)
         
         # Generate scenario analysis
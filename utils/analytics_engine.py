@@ -1,9 +1,35 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import re
 from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from typing import NamedTuple
+
+class DashboardData(NamedTuple):
+    """Everything the dashboard pages read, built once per load_dashboard_data call
+
+    The display-only segment tables are kept as Arrow; use .to_pandas() for pandas work.
+    """
+    analysis_df: pd.DataFrame
+    roi_df: pd.DataFrame
+    segment_analysis: pa.Table
+    segment_priorities: pa.Table
+    executive_summary: dict
+    model_stats: dict
+    last_updated: datetime
+    fingerprint: int = 0
+
+# Quadrant names indexed by (high_effort | high_impact << 1)
+QUADRANT_LABELS = np.array(["Fill-ins", "Questionable", "Quick Wins", "Major Projects"], dtype=object)
+
+# Owning team for a feature, by keywords in its name; checked in order
+TEAM_KEYWORDS = [
+    ("Backend Team", ['api', 'performance', 'backend', 'database']),
+    ("Mobile Team", ['mobile', 'app', 'ios', 'android']),
+    ("Frontend Team", ['ui', 'ux', 'design', 'interface', 'dark mode']),
+    ("Data Team", ['analytics', 'reporting', 'data'])
+]
+TEAM_KEYWORD_PATTERNS = [(team, '|'.join(map(re.escape, words))) for team, words in TEAM_KEYWORDS]
 
 class ProductAnalytics:
     def __init__(self, db_manager, prioritization_engine):
@@ -82,48 +108,51 @@ class ProductAnalytics:
     
     def calculate_roi_projections(self, df):
         """Calculate ROI projections for features"""
-        roi_data = []
+        top = df.head(15)  # Top 15 features
         
-        for _, row in df.head(15).iterrows():  # Top 15 features
-            # Development cost estimation
-            dev_cost = row['effort_estimate'] * 18000  # $18k per story point (updated rate)
-            
-            # Revenue benefit estimation
-            annual_revenue = (
-                row['avg_revenue_impact'] * 
-                max(row['unique_users'], row['request_count']) * 
-                (1 + row['avg_conversion_impact'] * 5) *  # Conversion multiplier
-                12  # Annual
-            )
-            
-            # Calculate ROI
-            roi = ((annual_revenue - dev_cost) / dev_cost) * 100 if dev_cost > 0 else 0
-            
-            # Payback period
-            monthly_revenue = annual_revenue / 12
-            payback_months = dev_cost / monthly_revenue if monthly_revenue > 0 else float('inf')
-            
-            roi_data.append({
-                'feature_name': row['feature_name'],
-                'development_cost': dev_cost,
-                'projected_annual_revenue': annual_revenue,
-                'roi_percentage': roi,
-                'payback_months': min(payback_months, 60),  # Cap at 5 years
-                'confidence_level': row['confidence_score'],
-                'risk_score': self._calculate_risk_score(row)
-            })
-        
-        return pd.DataFrame(roi_data)
+        # Development cost estimation
+        dev_cost = top['effort_estimate'].to_numpy(dtype=float) * 18000  # $18k per story point (updated rate)
+        
+        # Revenue benefit estimation
+        annual_revenue = (
+            top['avg_revenue_impact'].to_numpy(dtype=float) * 
+            np.maximum(top['unique_users'].to_numpy(dtype=float), top['request_count'].to_numpy(dtype=float)) * 
+            (1 + top['avg_conversion_impact'].to_numpy(dtype=float) * 5) *  # Conversion multiplier
+            12  # Annual
+        )
+        
+        # Calculate ROI
+        roi = np.divide((annual_revenue - dev_cost) * 100, dev_cost,
+                        out=np.zeros_like(dev_cost), where=dev_cost > 0)
+        
+        # Payback period
+        monthly_revenue = annual_revenue / 12
+        payback_months = np.divide(dev_cost, monthly_revenue,
+                                   out=np.full_like(dev_cost, np.inf), where=monthly_revenue > 0)
+        
+        return pd.DataFrame({
+            'feature_name': top['feature_name'].to_numpy(),
+            'development_cost': dev_cost,
+            'projected_annual_revenue': annual_revenue,
+            'roi_percentage': roi,
+            'payback_months': np.minimum(payback_months, 60),  # Cap at 5 years
+            'confidence_level': top['confidence_score'].to_numpy(dtype=float),
+            'risk_score': self._calculate_risk_score(top)
+        })
     
-    def _calculate_risk_score(self, row):
-        """Calculate risk score for a feature"""
+    def _calculate_risk_score(self, df):
+        """Calculate risk scores for a frame of features"""
         # High effort + low confidence = high risk
-        effort_risk = (row['effort_estimate'] / 25) * 30  # Effort contributes 30%
-        confidence_risk = (1 - row['confidence_score']) * 40  # Low confidence = high risk (40%)
-        complexity_risk = (row.get('technical_complexity', 50) / 100) * 30  # Complexity contributes 30%
+        effort_risk = (df['effort_estimate'].to_numpy(dtype=float) / 25) * 30  # Effort contributes 30%
+        confidence_risk = (1 - df['confidence_score'].to_numpy(dtype=float)) * 40  # Low confidence = high risk (40%)
+        if 'technical_complexity' in df.columns:
+            complexity = df['technical_complexity'].to_numpy(dtype=float)
+        else:
+            complexity = np.full(len(df), 50.0)
+        complexity_risk = (complexity / 100) * 30  # Complexity contributes 30%
         
         total_risk = effort_risk + confidence_risk + complexity_risk
-        return min(total_risk, 100)  # Cap at 100%
+        return np.minimum(total_risk, 100)  # Cap at 100%
     
     def analyze_customer_segments(self):
         """Analyze feature requests by customer segment"""
@@ -158,24 +187,17 @@ class ProductAnalytics:
         effort_median = matrix_data['effort_estimate'].median()
         impact_median = matrix_data['impact_score'].median()
         
-        def classify_quadrant(row):
-            if row['effort_estimate'] <= effort_median and row['impact_score'] > impact_median:
-                return "Quick Wins"
-            elif row['effort_estimate'] > effort_median and row['impact_score'] > impact_median:
-                return "Major Projects"
-            elif row['effort_estimate'] <= effort_median and row['impact_score'] <= impact_median:
-                return "Fill-ins"
-            else:
-                return "Questionable"
+        # Two-bit quadrant code per row: bit 0 = high effort, bit 1 = high impact
+        high_effort = matrix_data['effort_estimate'].to_numpy() > effort_median
+        high_impact = matrix_data['impact_score'].to_numpy() > impact_median
+        codes = high_effort.astype(np.uint8) | (high_impact.astype(np.uint8) << 1)
         
-        matrix_data['quadrant'] = matrix_data.apply(classify_quadrant, axis=1)
+        matrix_data['quadrant'] = QUADRANT_LABELS[codes]
         
         return matrix_data
     
     def create_timeline_data(self, df):
         """Create timeline data for Gantt charts"""
-        timeline_data = []
-        
         quarter_dates = {
             "Q1 2026": ("2026-01-01", "2026-03-31"),
             "Q2 2026": ("2026-04-01", "2026-06-30"),
@@ -183,37 +205,31 @@ class ProductAnalytics:
             "Q4 2026": ("2026-10-01", "2026-12-31")
         }
         
-        for _, row in df.iterrows():
-            quarter = row['recommended_quarter']
-            if quarter in quarter_dates:
-                start_date, end_date = quarter_dates[quarter]
-                
-                timeline_data.append({
-                    'feature_name': row['feature_name'],
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'quarter': quarter,
-                    'effort': row['effort_estimate'],
-                    'priority_score': row['composite_score'],
-                    'team': self._assign_team(row)
-                })
-        
-        return pd.DataFrame(timeline_data)
+        # Features outside the planned quarters have no dates and are left off the timeline
+        quarters = df['recommended_quarter'].astype(str)
+        mask = quarters.isin(quarter_dates).to_numpy()
+        planned = df[mask]
+        quarters = quarters[mask]
+        
+        return pd.DataFrame({
+            'feature_name': planned['feature_name'].to_numpy(),
+            'start_date': quarters.map({q: dates[0] for q, dates in quarter_dates.items()}).to_numpy(),
+            'end_date': quarters.map({q: dates[1] for q, dates in quarter_dates.items()}).to_numpy(),
+            'quarter': quarters.to_numpy(),
+            'effort': planned['effort_estimate'].to_numpy(),
+            'priority_score': planned['composite_score'].to_numpy(),
+            'team': self._assign_teams(planned['feature_name'])
+        })
     
-    def _assign_team(self, row):
-        """Assign team based on feature characteristics"""
-        feature_name = row['feature_name'].lower()
-        
-        if any(word in feature_name for word in ['api', 'performance', 'backend', 'database']):
-            return "Backend Team"
-        elif any(word in feature_name for word in ['mobile', 'app', 'ios', 'android']):
-            return "Mobile Team"
-        elif any(word in feature_name for word in ['ui', 'ux', 'design', 'interface', 'dark mode']):
-            return "Frontend Team"
-        elif any(word in feature_name for word in ['analytics', 'reporting', 'data']):
-            return "Data Team"
-        else:
-            return "Product Team"
+    def _assign_teams(self, feature_names):
+        """Assign teams based on feature names, first matching keyword group wins"""
+        names = feature_names.str.lower()
+        
+        return np.select(
+            [names.str.contains(pattern, regex=True).to_numpy(dtype=bool) for _, pattern in TEAM_KEYWORD_PATTERNS],
+            [team for team, _ in TEAM_KEYWORD_PATTERNS],
+            default="Product Team"
+        )
     
     def create_capacity_analysis(self, df):
         """Analyze team capacity and workload"""
@@ -225,8 +241,11 @@ class ProductAnalytics:
         quarterly_workload.columns = ['quarter', 'total_effort', 'feature_count']
         
         # Add capacity recommendations
-        quarterly_workload['recommended_capacity'] = quarterly_workload['total_effort'].apply(
-            lambda x: "Increase Team" if x > 120 else "Current Team" if x > 60 else "Consider Optimization"
+        total_effort = quarterly_workload['total_effort'].to_numpy()
+        quarterly_workload['recommended_capacity'] = np.select(
+            [total_effort > 120, total_effort > 60],
+            ["Increase Team", "Current Team"],
+            default="Consider Optimization"
         )
         
         return quarterly_workload
@@ -3,58 +3,128 @@ import pandas as pd
 from datetime import datetime, timedelta
 import random
 import os
+import threading
+from contextlib import contextmanager
+
+# Storage settings; page_size only takes effect after a VACUUM outside WAL mode
+PAGE_SIZE = 8192
+
+# Per-connection tuning for the read-heavy dashboard workload
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
 
 class DatabaseManager:
     def __init__(self, db_path="data/product_roadmap.db"):
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         self.db_path = db_path
+        
+        # One connection shared by every session and worker thread; the lock serializes
+        # access because a sqlite3 connection must not be used by two threads at once
+        self._lock = threading.RLock()
+        self.conn = self._connect()
         self.setup_database()
 
+    def _connect(self):
+        """Open a connection with the per-connection pragmas applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _locked(self):
+        """Hold the shared connection for the duration of the block"""
+        with self._lock:
+            try:
+                yield self.conn
+            except Exception:
+                # Don't leave a half-done write open for the next caller
+                self.conn.rollback()
+                raise
+
+    def _configure_storage(self, conn):
+        """Rebuild with the target page size if needed, then switch to WAL"""
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        if page_size != PAGE_SIZE:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            conn.execute(f"PRAGMA page_size={PAGE_SIZE}")
+            conn.execute("VACUUM")
+        conn.execute("PRAGMA journal_mode=WAL")
+
     def setup_database(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS customer_feedback (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            customer_id TEXT,
-            feature_request TEXT,
-            feedback_type TEXT,
-            priority_level TEXT,
-            source TEXT,
-            customer_segment TEXT,
-            revenue_impact REAL,
-            effort_estimate INTEGER,
-            business_value_score INTEGER,
-            created_date DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS usage_metrics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            feature_name TEXT,
-            user_id TEXT,
-            usage_count INTEGER,
-            session_duration REAL,
-            date_recorded DATE,
-            user_segment TEXT,
-            conversion_impact REAL,
-            retention_impact REAL
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self._locked() as conn:
+            self._configure_storage(conn)
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS customer_feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                customer_id TEXT,
+                feature_request TEXT,
+                feedback_type TEXT,
+                priority_level TEXT,
+                source TEXT,
+                customer_segment TEXT,
+                revenue_impact REAL,
+                effort_estimate INTEGER,
+                business_value_score INTEGER,
+                created_date DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS usage_metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                feature_name TEXT,
+                user_id TEXT,
+                usage_count INTEGER,
+                session_duration REAL,
+                date_recorded DATE,
+                user_segment TEXT,
+                conversion_impact REAL,
+                retention_impact REAL
+            )
+            ''')
+            
+            # Indexes on the GROUP BY keys used by the summary/analytics queries. The
+            # feedback one also carries every aggregated column, so the feedback summaries
+            # are answered from the index alone without touching the table. No query leads
+            # with customer_segment (segments are grouped in pandas), so it gets no index
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_customer_feedback_summary
+            ON customer_feedback (
+                feature_request, customer_segment, priority_level, feedback_type,
+                business_value_score, revenue_impact, effort_estimate
+            )
+            ''')
+            
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_usage_metrics_feature
+            ON usage_metrics (feature_name, user_id)
+            ''')
+            
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_usage_metrics_segment_date
+            ON usage_metrics (feature_name, user_segment, date_recorded)
+            ''')
+            
+            conn.commit()
+            
+            # Gather planner statistics once so the indexes above are actually chosen;
+            # afterwards PRAGMA optimize only rewrites them when they've gone stale, which
+            # keeps an unchanged database's mtime stable across restarts
+            has_stats = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            if not has_stats:
+                cursor.execute("ANALYZE")
+            cursor.execute("PRAGMA optimize")
 
     def generate_sample_data(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Clear existing data
-        cursor.execute("DELETE FROM customer_feedback")
-        cursor.execute("DELETE FROM usage_metrics")
-        
         features = [
             "Dark mode support", "Advanced search filters", "Mobile app improvements",
             "API rate limiting", "Real-time notifications", "Export functionality",
@@ -67,13 +137,8 @@ class DatabaseManager:
         segments = ["Enterprise", "SMB", "Startup", "Individual"]
         
         # Generate feedback data
-        for _ in range(150):
-            cursor.execute('''
-            INSERT INTO customer_feedback
-            (customer_id, feature_request, feedback_type, priority_level, source,
-            customer_segment, revenue_impact, effort_estimate, business_value_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        feedback_rows = [
+            (
                 random.choice(customers),
                 random.choice(features),
                 random.choice(['feature_request', 'enhancement', 'bug_report']),
@@ -83,73 +148,125 @@ class DatabaseManager:
                 round(random.uniform(1000, 50000), 2),
                 random.randint(1, 21),
                 random.randint(1, 10)
-            ))
+            )
+            for _ in range(150)
+        ]
         
         # Generate usage data
-        for _ in range(300):
-            cursor.execute('''
-            INSERT INTO usage_metrics
-            (feature_name, user_id, usage_count, session_duration, date_recorded,
-            user_segment, conversion_impact, retention_impact)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        today = datetime.now()
+        usage_rows = [
+            (
                 random.choice(features),
                 f"USER_{random.randint(1, 200):04d}",
                 random.randint(1, 50),
                 round(random.uniform(1, 120), 2),
-                (datetime.now() - timedelta(days=random.randint(0, 90))).date(),
+                (today - timedelta(days=random.randint(0, 90))).date().isoformat(),
                 random.choice(segments),
                 round(random.uniform(0.01, 0.15), 4),
                 round(random.uniform(0.02, 0.20), 4)
-            ))
+            )
+            for _ in range(300)
+        ]
         
-        conn.commit()
-        conn.close()
+        with self._locked() as conn:
+            # Clear and reload in a single transaction
+            with conn:
+                conn.execute("DELETE FROM customer_feedback")
+                conn.execute("DELETE FROM usage_metrics")
+                
+                conn.executemany('''
+                INSERT INTO customer_feedback
+                (customer_id, feature_request, feedback_type, priority_level, source,
+                customer_segment, revenue_impact, effort_estimate, business_value_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', feedback_rows)
+                
+                conn.executemany('''
+                INSERT INTO usage_metrics
+                (feature_name, user_id, usage_count, session_duration, date_recorded,
+                user_segment, conversion_impact, retention_impact)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', usage_rows)
         return True
 
+    def has_feedback(self):
+        """Whether any feedback rows exist, answered without scanning the table"""
+        try:
+            with self._locked() as conn:
+                exists = conn.execute(
+                    "SELECT EXISTS(SELECT 1 FROM customer_feedback)"
+                ).fetchone()[0]
+            return bool(exists)
+        except Exception as e:
+            print(f"Error in has_feedback: {e}")
+            return False
+
     def get_feedback_summary(self):
         try:
-            conn = sqlite3.connect(self.db_path)
-            query = '''
-            SELECT
-                feature_request,
-                COUNT(*) as request_count,
-                AVG(business_value_score) as avg_business_value,
-                AVG(revenue_impact) as avg_revenue_impact,
-                AVG(effort_estimate) as avg_effort,
-                customer_segment,
-                priority_level,
-                feedback_type
-            FROM customer_feedback
-            GROUP BY feature_request, customer_segment, priority_level, feedback_type
-            ORDER BY request_count DESC
-            '''
-            df = pd.read_sql(query, conn)
-            conn.close()
+            with self._locked() as conn:
+                query = '''
+                SELECT
+                    feature_request,
+                    COUNT(*) as request_count,
+                    AVG(business_value_score) as avg_business_value,
+                    AVG(revenue_impact) as avg_revenue_impact,
+                    AVG(effort_estimate) as avg_effort,
+                    customer_segment,
+                    priority_level,
+                    feedback_type
+                FROM customer_feedback
+                GROUP BY feature_request, customer_segment, priority_level, feedback_type
+                ORDER BY request_count DESC
+                '''
+                df = pd.read_sql(query, conn)
             return df
         except Exception as e:
             print(f"Error in get_feedback_summary: {e}")
             return pd.DataFrame()
 
+    def get_executive_summary_sql(self):
+        """Headline feedback counts from a single aggregate over the summary index"""
+        try:
+            with self._locked() as conn:
+                row = conn.execute('''
+                SELECT
+                    COUNT(DISTINCT feature_request) as total_features,
+                    COUNT(*) as total_requests,
+                    COUNT(*) FILTER (WHERE priority_level IN ('high', 'critical')) as high_priority_requests,
+                    COUNT(*) FILTER (WHERE priority_level = 'critical') as critical_requests
+                FROM customer_feedback
+                ''').fetchone()
+            return dict(zip(
+                ['total_features', 'total_requests', 'high_priority_requests', 'critical_requests'],
+                row
+            ))
+        except Exception as e:
+            print(f"Error in get_executive_summary_sql: {e}")
+            return {
+                'total_features': 0,
+                'total_requests': 0,
+                'high_priority_requests': 0,
+                'critical_requests': 0
+            }
+
     def get_usage_analytics(self):
         try:
-            conn = sqlite3.connect(self.db_path)
-            query = '''
-            SELECT
-                feature_name,
-                COUNT(DISTINCT user_id) as unique_users,
-                AVG(usage_count) as avg_usage,
-                AVG(session_duration) as avg_session_duration,
-                AVG(conversion_impact) as avg_conversion_impact,
-                AVG(retention_impact) as avg_retention_impact,
-                user_segment,
-                date_recorded
-            FROM usage_metrics
-            GROUP BY feature_name, user_segment, date_recorded
-            ORDER BY unique_users DESC
-            '''
-            df = pd.read_sql(query, conn)
-            conn.close()
+            with self._locked() as conn:
+                query = '''
+                SELECT
+                    feature_name,
+                    COUNT(DISTINCT user_id) as unique_users,
+                    AVG(usage_count) as avg_usage,
+                    AVG(session_duration) as avg_session_duration,
+                    AVG(conversion_impact) as avg_conversion_impact,
+                    AVG(retention_impact) as avg_retention_impact,
+                    user_segment,
+                    date_recorded
+                FROM usage_metrics
+                GROUP BY feature_name, user_segment, date_recorded
+                ORDER BY unique_users DESC
+                '''
+                df = pd.read_sql(query, conn)
             return df
         except Exception as e:
             print(f"Error in get_usage_analytics: {e}")
@@ -158,38 +275,35 @@ class DatabaseManager:
     def get_feature_analytics_summary(self):
         """Get feature analytics - SQLite compatible (no FULL OUTER JOIN)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            # Get feedback data
-            feedback_query = '''
-            SELECT
-                feature_request as feature_name,
-                COUNT(*) as request_count,
-                AVG(business_value_score) as avg_business_value,
-                AVG(revenue_impact) as avg_revenue_impact,
-                AVG(effort_estimate) as avg_effort,
-                SUM(CASE WHEN priority_level = 'critical' THEN 1 ELSE 0 END) as critical_requests,
-                SUM(CASE WHEN priority_level = 'high' THEN 1 ELSE 0 END) as high_requests
-            FROM customer_feedback
-            GROUP BY feature_request
-            '''
-            feedback_df = pd.read_sql(feedback_query, conn)
-            
-            # Get usage data
-            usage_query = '''
-            SELECT
-                feature_name,
-                COUNT(DISTINCT user_id) as unique_users,
-                AVG(usage_count) as avg_usage,
-                AVG(session_duration) as avg_session_duration,
-                AVG(conversion_impact) as avg_conversion_impact,
-                AVG(retention_impact) as avg_retention_impact
-            FROM usage_metrics
-            GROUP BY feature_name
-            '''
-            usage_df = pd.read_sql(usage_query, conn)
-            
-            conn.close()
+            with self._locked() as conn:
+                # Get feedback data
+                feedback_query = '''
+                SELECT
+                    feature_request as feature_name,
+                    COUNT(*) as request_count,
+                    AVG(business_value_score) as avg_business_value,
+                    AVG(revenue_impact) as avg_revenue_impact,
+                    AVG(effort_estimate) as avg_effort,
+                    SUM(CASE WHEN priority_level = 'critical' THEN 1 ELSE 0 END) as critical_requests,
+                    SUM(CASE WHEN priority_level = 'high' THEN 1 ELSE 0 END) as high_requests
+                FROM customer_feedback
+                GROUP BY feature_request
+                '''
+                feedback_df = pd.read_sql(feedback_query, conn)
+                
+                # Get usage data
+                usage_query = '''
+                SELECT
+                    feature_name,
+                    COUNT(DISTINCT user_id) as unique_users,
+                    AVG(usage_count) as avg_usage,
+                    AVG(session_duration) as avg_session_duration,
+                    AVG(conversion_impact) as avg_conversion_impact,
+                    AVG(retention_impact) as avg_retention_impact
+                FROM usage_metrics
+                GROUP BY feature_name
+                '''
+                usage_df = pd.read_sql(usage_query, conn)
             
             # Use pandas merge instead of SQL FULL OUTER JOIN
             merged_df = pd.merge(feedback_df, usage_df, on='feature_name', how='outer')
@@ -222,18 +336,17 @@ class DatabaseManager:
 
     def add_feedback(self, feedback_data):
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            INSERT INTO customer_feedback
-            (customer_id, feature_request, feedback_type, priority_level, source,
-            customer_segment, revenue_impact, effort_estimate, business_value_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', feedback_data)
-            
-            conn.commit()
-            conn.close()
+            with self._locked() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                INSERT INTO customer_feedback
+                (customer_id, feature_request, feedback_type, priority_level, source,
+                customer_segment, revenue_impact, effort_estimate, business_value_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', feedback_data)
+                
+                conn.commit()
             return True
         except Exception as e:
             print(f"Error adding feedback: {e}")
@@ -242,26 +355,25 @@ class DatabaseManager:
     def log_ai_query(self, query_text, role, response):
         """Log AI queries - simplified implementation"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS ai_queries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                query_text TEXT,
-                role TEXT,
-                response TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            cursor.execute('''
-            INSERT INTO ai_queries (query_text, role, response)
-            VALUES (?, ?, ?)
-            ''', (query_text, role, str(response)))
-            
-            conn.commit()
-            conn.close()
+            with self._locked() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ai_queries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    query_text TEXT,
+                    role TEXT,
+                    response TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                ''')
+                
+                cursor.execute('''
+                INSERT INTO ai_queries (query_text, role, response)
+                VALUES (?, ?, ?)
+                ''', (query_text, role, str(response)))
+                
+                conn.commit()
             return True
         except Exception as e:
             print(f"Error logging AI query: {e}")
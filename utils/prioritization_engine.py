@@ -1,15 +1,18 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import joblib
 import os
 
+# Roadmap quarters in delivery order, highest-priority bucket first
+ROADMAP_QUARTERS = ["Q1 2026", "Q2 2026", "Q3 2026", "Q4 2026"]
+
+# RICE impact scale and the upper bound of the blended impact for each step
+IMPACT_SCALE = np.array([0.25, 0.5, 1, 2, 3])
+IMPACT_BOUNDS = np.array([0.1, 0.3, 0.6, 0.8])
+
 class FeaturePrioritizationEngine:
     def __init__(self, db_manager):
         self.db_manager = db_manager
-        self.scaler = StandardScaler()
+        self.scaler = None
         self.ml_model = None
         self.model_path = "models/"
         
@@ -20,105 +23,92 @@ class FeaturePrioritizationEngine:
         """Calculate RICE scores for all features"""
         features_df = self.db_manager.get_feature_analytics_summary()
         
-        rice_scores = []
-        
-        for _, row in features_df.iterrows():
-            # RICE Components
-            reach = self._calculate_reach_score(row)
-            impact = self._calculate_impact_score(row)
-            confidence = self._calculate_confidence_score(row)
-            effort = max(row['avg_effort'], 1)  # Avoid division by zero
-            
-            rice_score = (reach * impact * confidence) / effort
-            
-            rice_scores.append({
-                'feature_name': row['feature_name'],
-                'reach_score': reach,
-                'impact_score': impact,
-                'confidence_score': confidence,
-                'effort_estimate': effort,
-                'rice_score': rice_score,
-                'request_count': row['request_count'],
-                'avg_business_value': row['avg_business_value'],
-                'avg_revenue_impact': row['avg_revenue_impact'],
-                'unique_users': row['unique_users'],
-                'avg_conversion_impact': row['avg_conversion_impact'],
-                'avg_retention_impact': row['avg_retention_impact'],
-                'critical_requests': row['critical_requests'],
-                'high_requests': row['high_requests']
-            })
-        
-        df = pd.DataFrame(rice_scores)
+        # RICE Components, computed for every feature at once
+        reach = self._calculate_reach_score(features_df)
+        impact = self._calculate_impact_score(features_df)
+        confidence = self._calculate_confidence_score(features_df)
+        effort = np.maximum(features_df['avg_effort'].to_numpy(dtype=float), 1)  # Avoid division by zero
+        
+        rice_score = (reach * impact * confidence) / effort
+        
+        df = pd.DataFrame({
+            'feature_name': features_df['feature_name'].to_numpy(),
+            'reach_score': reach,
+            'impact_score': impact,
+            'confidence_score': confidence,
+            'effort_estimate': effort,
+            'rice_score': rice_score,
+            'request_count': features_df['request_count'].to_numpy(),
+            'avg_business_value': features_df['avg_business_value'].to_numpy(),
+            'avg_revenue_impact': features_df['avg_revenue_impact'].to_numpy(),
+            'unique_users': features_df['unique_users'].to_numpy(),
+            'avg_conversion_impact': features_df['avg_conversion_impact'].to_numpy(),
+            'avg_retention_impact': features_df['avg_retention_impact'].to_numpy(),
+            'critical_requests': features_df['critical_requests'].to_numpy(),
+            'high_requests': features_df['high_requests'].to_numpy()
+        })
         df = df.sort_values('rice_score', ascending=False)
         df['priority_rank'] = range(1, len(df) + 1)
         
         return df
     
-    def _calculate_reach_score(self, row):
-        """Calculate reach score based on users and requests"""
-        user_reach = row['unique_users']
-        request_reach = row['request_count'] * 2  # Weight requests
-        priority_multiplier = 1 + (row['critical_requests'] * 0.5) + (row['high_requests'] * 0.3)
-        
-        return max(user_reach, request_reach) * priority_multiplier
+    def _calculate_reach_score(self, df):
+        """Calculate reach scores based on users and requests"""
+        user_reach = df['unique_users'].to_numpy(dtype=float)
+        request_reach = df['request_count'].to_numpy(dtype=float) * 2  # Weight requests
+        priority_multiplier = (1 + df['critical_requests'].to_numpy(dtype=float) * 0.5
+                               + df['high_requests'].to_numpy(dtype=float) * 0.3)
+        
+        return np.maximum(user_reach, request_reach) * priority_multiplier
     
-    def _calculate_impact_score(self, row):
-        """Calculate impact score based on business value and usage metrics"""
+    def _calculate_impact_score(self, df):
+        """Calculate impact scores based on business value and usage metrics"""
         # Normalize business value (0-1 scale)
-        business_value = min(row['avg_business_value'] / 10, 1)
+        business_value = np.minimum(df['avg_business_value'].to_numpy(dtype=float) / 10, 1)
         
         # Normalize revenue impact (scaled to reasonable range)
-        revenue_impact = min(row['avg_revenue_impact'] / 50000, 1)
+        revenue_impact = np.minimum(df['avg_revenue_impact'].to_numpy(dtype=float) / 50000, 1)
         
         # Usage impact
-        conversion_impact = row['avg_conversion_impact'] * 20
-        retention_impact = row['avg_retention_impact'] * 15
+        conversion_impact = df['avg_conversion_impact'].to_numpy(dtype=float) * 20
+        retention_impact = df['avg_retention_impact'].to_numpy(dtype=float) * 15
         
         # Weighted combination
         impact = (business_value * 0.3 + revenue_impact * 0.3 + 
                  conversion_impact * 0.2 + retention_impact * 0.2)
         
-        # Convert to RICE impact scale (0.25, 0.5, 1, 2, 3)
-        if impact <= 0.1:
-            return 0.25
-        elif impact <= 0.3:
-            return 0.5
-        elif impact <= 0.6:
-            return 1
-        elif impact <= 0.8:
-            return 2
-        else:
-            return 3
+        # Convert to RICE impact scale (0.25, 0.5, 1, 2, 3); each bound is inclusive
+        return IMPACT_SCALE[np.searchsorted(IMPACT_BOUNDS, impact, side='left')]
     
-    def _calculate_confidence_score(self, row):
-        """Calculate confidence score based on data quality"""
-        base_confidence = 0.4
+    def _calculate_confidence_score(self, df):
+        """Calculate confidence scores based on data quality"""
+        request_count = df['request_count'].to_numpy(dtype=float)
+        unique_users = df['unique_users'].to_numpy(dtype=float)
+        business_value = df['avg_business_value'].to_numpy(dtype=float)
         
-        # More data points = higher confidence
-        if row['request_count'] > 15:
-            base_confidence += 0.2
-        elif row['request_count'] > 5:
-            base_confidence += 0.1
+        base_confidence = np.full(len(df), 0.4)
         
-        if row['unique_users'] > 30:
-            base_confidence += 0.2
-        elif row['unique_users'] > 10:
-            base_confidence += 0.1
+        # More data points = higher confidence
+        base_confidence += np.select([request_count > 15, request_count > 5], [0.2, 0.1], default=0)
+        base_confidence += np.select([unique_users > 30, unique_users > 10], [0.2, 0.1], default=0)
         
         # High business value = higher confidence
-        if row['avg_business_value'] > 8:
-            base_confidence += 0.15
-        elif row['avg_business_value'] > 6:
-            base_confidence += 0.1
+        base_confidence += np.select([business_value > 8, business_value > 6], [0.15, 0.1], default=0)
         
         # Critical/high priority requests = higher confidence
-        if row['critical_requests'] > 0 or row['high_requests'] > 2:
-            base_confidence += 0.05
+        has_urgent = (df['critical_requests'].to_numpy() > 0) | (df['high_requests'].to_numpy() > 2)
+        base_confidence += np.where(has_urgent, 0.05, 0)
         
-        return min(base_confidence, 1.0)
+        return np.minimum(base_confidence, 1.0)
     
     def train_ml_prioritization_model(self):
         """Train ML model for advanced feature prioritization"""
+        # scikit-learn and joblib are only needed here, so import them on first training
+        from sklearn.ensemble import GradientBoostingRegressor
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.model_selection import train_test_split
+        import joblib
+        
         rice_df = self.calculate_rice_scores()
         
         if len(rice_df) < 10:
@@ -145,6 +135,7 @@ class FeaturePrioritizationEngine:
             X_combined, y_combined, test_size=0.2, random_state=42
         )
         
+        self.scaler = StandardScaler()
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
@@ -240,17 +231,12 @@ class FeaturePrioritizationEngine:
         q2_threshold = df_copy['composite_score'].quantile(0.50)
         q3_threshold = df_copy['composite_score'].quantile(0.25)
         
-        def assign_quarter(score):
-            if score >= q1_threshold:
-                return "Q1 2026"
-            elif score >= q2_threshold:
-                return "Q2 2026"
-            elif score >= q3_threshold:
-                return "Q3 2026"
-            else:
-                return "Q4 2026"
-        
-        df_copy['recommended_quarter'] = df_copy['composite_score'].apply(assign_quarter)
+        scores = df_copy['composite_score'].to_numpy()
+        df_copy['recommended_quarter'] = np.select(
+            [scores >= q1_threshold, scores >= q2_threshold, scores >= q3_threshold],
+            ROADMAP_QUARTERS[:3],
+            default=ROADMAP_QUARTERS[3]
+        )
         
         return df_copy
 